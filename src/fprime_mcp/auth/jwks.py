@@ -0,0 +1,112 @@
+"""Local JWT validation against the Microsoft Entra ID JWKS."""
+
+import asyncio
+import logging
+
+import jwt
+import orjson
+from jwt import PyJWK
+
+from fprime_mcp.auth.oidc_config import get_oidc_config
+from fprime_mcp.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# kid -> pre-parsed key. Materializing a JWK dict into an OpenSSL key
+# object costs more than the RS256 verify itself, so do it once per key
+# at fetch time rather than on every validation.
+_keys_by_kid: dict[str, PyJWK] = {}
+
+# Serializes refreshes triggered by an unknown kid so a burst of requests
+# signed with a freshly rotated key causes one fetch, not a stampede.
+_refresh_lock = asyncio.Lock()
+
+# ETag of the last JWKS fetch; lets periodic refreshes be conditional so
+# the common unchanged case is a 304 with no body to parse.
+_etag: str | None = None
+
+
+async def refresh_jwks() -> None:
+    """Fetch the tenant JWKS and rebuild the kid -> parsed-key cache."""
+    global _keys_by_kid, _etag
+    config = get_oidc_config()
+
+    headers = {"If-None-Match": _etag} if _etag and _keys_by_kid else None
+    resp = await get_http_client().get(config.jwks_uri, headers=headers)
+    if resp.status_code == 304:
+        logger.debug("JWKS unchanged (ETag match)")
+        return
+    resp.raise_for_status()
+    _etag = resp.headers.get("etag")
+
+    keys = {}
+    for key_dict in orjson.loads(resp.content).get("keys", []):
+        try:
+            keys[key_dict["kid"]] = PyJWK(key_dict)
+        except (KeyError, jwt.PyJWKError) as e:
+            logger.warning("Skipping unusable JWK: %s", e)
+
+    _keys_by_kid = keys
+    logger.info("Loaded %d signing keys from JWKS", len(keys))
+
+
+# Refresh cadence for the background loop. Entra ID rotates signing keys
+# rarely; hourly refreshes keep the cache warm without blocking requests.
+_REFRESH_INTERVAL_S = 3600.0
+
+
+async def jwks_refresh_loop() -> None:
+    """Periodically refresh the JWKS so the verify path never fetches.
+
+    Started as a background task at application startup; failures are
+    logged and retried at the next interval, with the unknown-kid path
+    in validate_access_token as the inline fallback.
+    """
+    while True:
+        try:
+            async with _refresh_lock:
+                await refresh_jwks()
+        except Exception as e:
+            logger.warning("Background JWKS refresh failed: %s", e)
+        await asyncio.sleep(_REFRESH_INTERVAL_S)
+
+
+async def validate_access_token(token: str) -> dict | None:
+    """Validate a bearer token against the tenant JWKS.
+
+    Returns the verified claims, or None when the token cannot be
+    validated locally (not a JWT, unknown signing key, bad signature or
+    claims) so callers can fall back to the userinfo endpoint.
+    """
+    try:
+        header = jwt.get_unverified_header(token)
+    except jwt.InvalidTokenError:
+        return None
+
+    kid = header.get("kid", "")
+    key = _keys_by_kid.get(kid)
+    if key is None:
+        # Unknown kid usually means the IdP rotated keys; refresh once
+        # under a lock and retry the lookup before giving up.
+        async with _refresh_lock:
+            if kid not in _keys_by_kid:
+                try:
+                    await refresh_jwks()
+                except Exception as e:
+                    logger.warning("JWKS refresh on unknown kid failed: %s", e)
+                    return None
+        key = _keys_by_kid.get(kid)
+        if key is None:
+            return None
+
+    config = get_oidc_config()
+    try:
+        return jwt.decode(
+            token,
+            key=key.key,
+            algorithms=["RS256"],
+            audience=config.client_id,
+            issuer=config.issuer,
+        )
+    except jwt.InvalidTokenError:
+        return None
@@ -1,12 +1,13 @@
 """OIDC Configuration for F-Prime MCP Server."""
 
-import boto3
-import json
-from dataclasses import dataclass
+import orjson
+from dataclasses import dataclass, field
 from functools import lru_cache
 
+from fprime_mcp.aws import get_secretsmanager_client
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class OIDCConfig:
     client_id: str
     client_secret: str
@@ -14,41 +15,32 @@ class OIDCConfig:
     redirect_uri: str = "http://localhost:8000/auth/callback"
     home_uri: str = "http://localhost:8000/"
     scopes: str = "openid email profile"
-    
-    @property
-    def issuer(self) -> str:
-        return f"https://login.microsoftonline.com/{self.tenant_id}/v2.0"
-    
-    @property
-    def authorization_endpoint(self) -> str:
-        return f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/authorize"
-    
-    @property
-    def token_endpoint(self) -> str:
-        return f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/token"
-    
-    @property
-    def userinfo_endpoint(self) -> str:
-        return "https://graph.microsoft.com/oidc/userinfo"
-    
-    @property
-    def jwks_uri(self) -> str:
-        return f"https://login.microsoftonline.com/{self.tenant_id}/discovery/v2.0/keys"
+    # Endpoint URLs derived from tenant_id, formatted once at
+    # construction instead of on every property access.
+    issuer: str = field(init=False)
+    authorization_endpoint: str = field(init=False)
+    token_endpoint: str = field(init=False)
+    userinfo_endpoint: str = field(init=False)
+    jwks_uri: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        authority = f"https://login.microsoftonline.com/{self.tenant_id}"
+        object.__setattr__(self, "issuer", f"{authority}/v2.0")
+        object.__setattr__(self, "authorization_endpoint", f"{authority}/oauth2/v2.0/authorize")
+        object.__setattr__(self, "token_endpoint", f"{authority}/oauth2/v2.0/token")
+        object.__setattr__(self, "userinfo_endpoint", "https://graph.microsoft.com/oidc/userinfo")
+        object.__setattr__(self, "jwks_uri", f"{authority}/discovery/v2.0/keys")
 
 
 @lru_cache(maxsize=1)
 def get_oidc_config() -> OIDCConfig:
     """Load OIDC configuration from AWS Secrets Manager."""
-    secret_name = "webpage_token"
-    region_name = "us-east-2"
-    
-    session = boto3.session.Session()
-    client = session.client(service_name='secretsmanager', region_name=region_name)
-    response = client.get_secret_value(SecretId=secret_name)
-    secrets = json.loads(response['SecretString'])
-    
+    client = get_secretsmanager_client()
+    response = client.get_secret_value(SecretId='webpage_token')
+    secrets = orjson.loads(response['SecretString'])
+
     return OIDCConfig(
         client_id=secrets['entra_mcp_clientid'],
         client_secret=secrets['entra_mcp_clientsecret'],
         tenant_id='7c2f7d68-9e11-48ca-81bd-362a0baa5fc2'
-    )
\ No newline at end of file
+    )
@@ -1,20 +1,27 @@
 """Authentication routes for OIDC login/logout flow."""
 
+import base64
+import hashlib
 import secrets
 import logging
+from functools import lru_cache
 from urllib.parse import urlencode
-import httpx
 from fastapi import APIRouter, Request, HTTPException, status
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 
 from fprime_mcp.auth.oidc_config import get_oidc_config
+from fprime_mcp.auth.userinfo import userinfo_cache, userinfo_cache_key
+from fprime_mcp.cache import SimpleTTLCache
+from fprime_mcp.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
-# In-memory state storage (use Redis in production)
-_auth_states: dict[str, dict] = {}
+# In-memory state storage (use Redis in production). TTL-bounded so
+# abandoned logins (state created, callback never hit) cannot leak; ten
+# minutes comfortably covers a user completing the IdP redirect.
+_auth_states = SimpleTTLCache(maxsize=4096, ttl_s=600.0)
 
 
 # =============================================================================
@@ -22,34 +29,56 @@ _auth_states: dict[str, dict] = {}
 # =============================================================================
 
 
-@router.get("/login")
-async def login(request: Request):
-    """
-    Initiate OIDC login flow.
-    Redirects to Microsoft Entra ID for authentication.
+@lru_cache(maxsize=1)
+def _authorization_url_prefix() -> str:
+    """Authorization endpoint plus the per-process-invariant query params.
+
+    Only state, nonce and the PKCE challenge vary per login; everything
+    else is urlencoded once.
     """
     config = get_oidc_config()
-    
-    # Generate state and nonce for CSRF protection
-    state = secrets.token_urlsafe(32)
-    nonce = secrets.token_urlsafe(32)
-    
-    # Store state for validation on callback
-    _auth_states[state] = {"nonce": nonce}
-    
-    # Build authorization URL
-    params = {
+    static_params = {
         "client_id": config.client_id,
         "response_type": "code",
         "redirect_uri": config.redirect_uri,
         "scope": config.scopes,
-        "state": state,
-        "nonce": nonce,
         "response_mode": "query",
+        "code_challenge_method": "S256",
     }
-    
-    auth_url = f"{config.authorization_endpoint}?{urlencode(params)}"
-    
+    return f"{config.authorization_endpoint}?{urlencode(static_params)}"
+
+
+@router.get("/login")
+async def login(request: Request):
+    """
+    Initiate OIDC login flow.
+    Redirects to Microsoft Entra ID for authentication.
+    """
+    # One getrandom() syscall covers the PKCE verifier, state and nonce;
+    # slice the buffer instead of drawing entropy three times.
+    raw = secrets.token_bytes(112)
+    state = base64.urlsafe_b64encode(raw[48:80]).rstrip(b"=").decode()
+    nonce = base64.urlsafe_b64encode(raw[80:]).rstrip(b"=").decode()
+
+    # PKCE (S256): the challenge is the SHA-256 of the verifier's ASCII
+    # bytes, so hash the base64url bytes directly — no str round-trip.
+    verifier_bytes = base64.urlsafe_b64encode(raw[:48]).rstrip(b"=")
+    code_challenge = (
+        base64.urlsafe_b64encode(hashlib.sha256(verifier_bytes).digest())
+        .rstrip(b"=")
+        .decode()
+    )
+
+    # Store state for validation on callback
+    _auth_states.set(state, {"nonce": nonce, "code_verifier": verifier_bytes.decode()})
+
+    # Build authorization URL: cached static prefix plus the per-login
+    # values, all of which are base64url and need no further quoting.
+    auth_url = (
+        f"{_authorization_url_prefix()}"
+        f"&state={state}&nonce={nonce}&code_challenge={code_challenge}"
+    )
+
     return RedirectResponse(url=auth_url, status_code=status.HTTP_302_FOUND)
 
 
@@ -69,7 +98,7 @@ async def auth_callback(
     
     # Handle error response from IdP
     if error:
-        logger.error(f"OIDC error: {error} - {error_description}")
+        logger.error("OIDC error: %s - %s", error, error_description)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Authentication failed: {error_description or error}",
@@ -82,16 +111,14 @@ async def auth_callback(
             detail="Missing authorization code or state",
         )
     
-    # Validate state (CSRF protection)
-    if state not in _auth_states:
+    # Validate state (CSRF protection); pop so each state is single-use
+    stored_state = _auth_states.pop(state)
+    if stored_state is None:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid or expired state parameter",
         )
     
-    # Remove used state
-    stored_state = _auth_states.pop(state)
-    
     # Exchange code for tokens
     token_data = {
         "client_id": config.client_id,
@@ -99,39 +126,40 @@ async def auth_callback(
         "code": code,
         "redirect_uri": config.redirect_uri,
         "grant_type": "authorization_code",
+        "code_verifier": stored_state["code_verifier"],
     }
     
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            config.token_endpoint,
-            data=token_data,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
+    # httpx sets Content-Type: application/x-www-form-urlencoded for
+    # dict data; no need to pass headers.
+    client = get_http_client()
+    resp = await client.post(config.token_endpoint, data=token_data)
+
+    if resp.status_code != 200:
+        logger.error("Token exchange failed: %s", resp.text)
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Failed to exchange authorization code",
         )
-        
-        if resp.status_code != 200:
-            logger.error(f"Token exchange failed: {resp.text}")
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Failed to exchange authorization code",
-            )
-        
-        tokens = resp.json()
+
+    tokens = resp.json()
     
     access_token = tokens.get("access_token")
     id_token = tokens.get("id_token")
     
     # Get user info
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(
-            config.userinfo_endpoint,
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        
-        if resp.status_code == 200:
-            user_info = resp.json()
-        else:
-            user_info = {}
-    
+    resp = await client.get(
+        config.userinfo_endpoint,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+    if resp.status_code == 200:
+        user_info = resp.json()
+        # Prime the userinfo cache: the user's next /auth/user (or tool
+        # call) with this fresh token should not repeat the fetch.
+        userinfo_cache.set(userinfo_cache_key(access_token), user_info)
+    else:
+        user_info = {}
+
     # Create session cookie with token
     response = RedirectResponse(url=config.home_uri, status_code=status.HTTP_302_FOUND)
     
@@ -145,7 +173,7 @@ async def auth_callback(
         max_age=3600,  # 1 hour
     )
     
-    logger.info(f"User {user_info.get('email', 'unknown')} logged in successfully")
+    logger.info("User %s logged in successfully", user_info.get("email", "unknown"))
     
     return response
 
@@ -164,22 +192,25 @@ async def get_user(request: Request):
             detail="Not authenticated",
         )
     
-    # Get user info from Microsoft Graph
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(
+    # Get user info from Microsoft Graph (cached per token)
+    cache_key = userinfo_cache_key(token)
+    user_info = userinfo_cache.get(cache_key)
+    if user_info is None:
+        resp = await get_http_client().get(
             config.userinfo_endpoint,
             headers={"Authorization": f"Bearer {token}"},
         )
-        
+
         if resp.status_code != 200:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Invalid or expired session",
             )
-        
+
         user_info = resp.json()
-    
-    return JSONResponse(content={
+        userinfo_cache.set(cache_key, user_info)
+
+    return ORJSONResponse(content={
         "email": user_info.get("email"),
         "name": user_info.get("name"),
         "sub": user_info.get("sub"),
@@ -0,0 +1,19 @@
+"""Shared per-token cache of Microsoft userinfo responses.
+
+Both the auth routes and the MCP endpoints resolve a bearer token to an
+identity; caching the userinfo payload per token keeps Entra's latency
+out of that path within a token's lifetime.
+"""
+
+import hashlib
+
+from fprime_mcp.cache import SimpleTTLCache
+
+# Five minutes bounds how long a revoked token can keep resolving to a
+# cached identity while still absorbing chatty per-tool-call lookups.
+userinfo_cache = SimpleTTLCache(maxsize=10_000, ttl_s=300.0)
+
+
+def userinfo_cache_key(token: str) -> bytes:
+    """Hash the token so raw bearer tokens never sit in the cache as keys."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
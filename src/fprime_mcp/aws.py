@@ -0,0 +1,16 @@
+"""Shared AWS clients for the F-Prime MCP Server."""
+
+import boto3
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def get_boto3_session() -> boto3.session.Session:
+    """Shared boto3 session; constructing one is ~200ms of cold start."""
+    return boto3.session.Session()
+
+
+@lru_cache(maxsize=4)
+def get_secretsmanager_client(region_name: str = 'us-east-2'):
+    """Cached Secrets Manager client for the given region."""
+    return get_boto3_session().client(service_name='secretsmanager', region_name=region_name)
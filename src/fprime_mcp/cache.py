@@ -0,0 +1,66 @@
+"""Small in-process TTL cache for the F-Prime MCP Server."""
+
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+
+# Purge all expired entries once every N cache operations, so stale keys
+# cannot pile up between evictions.
+_SWEEP_EVERY = 64
+
+
+class SimpleTTLCache:
+    """Thread-safe TTL cache with O(1) FIFO eviction.
+
+    Entries are stored in an OrderedDict so the oldest entry can be
+    evicted with popitem(last=False) instead of scanning the whole store.
+    Expiry uses time.monotonic, which is immune to wall-clock jumps.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl_s: float = 300.0):
+        self._store: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl_s = ttl_s
+        self._lock = Lock()
+        self._ops = 0
+
+    def _maybe_sweep(self) -> None:
+        """Amortized purge of expired entries; caller must hold the lock."""
+        self._ops += 1
+        if self._ops % _SWEEP_EVERY == 0:
+            now = time.monotonic()
+            self._store = OrderedDict(
+                (k, v) for k, v in self._store.items() if v[0] > now
+            )
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            self._maybe_sweep()
+            entry = self._store.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._store[key]
+                return default
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._maybe_sweep()
+            if key in self._store:
+                del self._store[key]
+            elif len(self._store) >= self._maxsize:
+                self._store.popitem(last=False)
+            self._store[key] = (time.monotonic() + self._ttl_s, value)
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._store.pop(key, None)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                return default
+            return value
@@ -0,0 +1,33 @@
+"""Shared async HTTP client for the F-Prime MCP Server.
+
+A single pooled httpx.AsyncClient keeps connections to Microsoft's
+endpoints alive across requests instead of paying a DNS + TCP + TLS
+handshake per call.
+"""
+
+import httpx
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=100,
+                keepalive_expiry=60.0,
+            ),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client; called at application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
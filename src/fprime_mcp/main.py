@@ -1,16 +1,20 @@
 """Main FastAPI application for F-Prime MCP Server."""
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import json
+from fastapi.responses import ORJSONResponse
+import orjson
 
 from fprime_mcp.auth.routes import router as auth_router
+from fprime_mcp.auth.jwks import jwks_refresh_loop, validate_access_token
 from fprime_mcp.auth.oidc_config import get_oidc_config
-from fprime_mcp.tools.therapeutics import query_therapeutics_landscape
+from fprime_mcp.auth.userinfo import userinfo_cache, userinfo_cache_key
+from fprime_mcp.http_client import close_http_client, get_http_client
+from fprime_mcp.tools.therapeutics import get_secrets, query_therapeutics_landscape
 
 # Configure logging
 logging.basicConfig(
@@ -25,18 +29,38 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     logger.info("Starting F-Prime MCP Server...")
     
-    # Validate OIDC config on startup
-    try:
-        config = get_oidc_config()
-        logger.info(f"OIDC configured for tenant: {config.tenant_id}")
-        logger.info(f"Redirect URI: {config.redirect_uri}")
-    except Exception as e:
-        logger.error(f"Failed to load OIDC config: {e}")
-        raise
-    
+    # Both startup secret fetches are blocking boto3 calls; run them in
+    # worker threads, overlapped, so startup pays for the slower one only.
+    config, tool_secrets = await asyncio.gather(
+        asyncio.to_thread(get_oidc_config),
+        asyncio.to_thread(get_secrets),
+        return_exceptions=True,
+    )
+
+    # OIDC config is required; validate it on startup as before.
+    if isinstance(config, BaseException):
+        logger.error("Failed to load OIDC config: %s", config)
+        raise config
+    logger.info("OIDC configured for tenant: %s", config.tenant_id)
+    logger.info("Redirect URI: %s", config.redirect_uri)
+
+    # Tool secrets are a warm-up only; tools retry on their own.
+    if isinstance(tool_secrets, BaseException):
+        logger.warning("Could not pre-warm tool secrets: %s", tool_secrets)
+
+    # Keep signing keys warm off the request path; the loop does the
+    # initial fetch too, so verifies work as soon as it completes.
+    jwks_task = asyncio.create_task(jwks_refresh_loop())
+
     yield
-    
+
     logger.info("Shutting down F-Prime MCP Server...")
+    jwks_task.cancel()
+    try:
+        await jwks_task
+    except asyncio.CancelledError:
+        pass
+    await close_http_client()
 
 
 # Create FastAPI application
@@ -45,12 +69,18 @@ app = FastAPI(
     description="MCP Server for F-Prime internal tools with Microsoft Entra ID authentication",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# Configure CORS. Starlette scans this list per request, so keep it
+# duplicate-free (dict.fromkeys dedupes while preserving order).
+CORS_ORIGINS = list(
+    dict.fromkeys(["http://localhost:3000", "http://localhost:8000", "https://claude.ai"])
 )
 
-# Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:8000", "https://claude.ai"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -64,22 +94,28 @@ app.include_router(auth_router)
 # Health and Status Endpoints
 # =============================================================================
 
+# Constant response bodies, built once instead of per probe. Handlers
+# return them directly; callers treat responses as read-only.
+_HEALTH_RESPONSE = {"status": "healthy", "service": "fprime-mcp-server"}
+_ROOT_RESPONSE = {
+    "service": "F-Prime MCP Server",
+    "version": "0.1.0",
+    "auth_required": True,
+    "login_url": "/auth/login",
+    "docs_url": "/docs",
+}
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy", "service": "fprime-mcp-server"}
+    return _HEALTH_RESPONSE
 
 
 @app.get("/")
 async def root():
     """Root endpoint with service information."""
-    return {
-        "service": "F-Prime MCP Server",
-        "version": "0.1.0",
-        "auth_required": True,
-        "login_url": "/auth/login",
-        "docs_url": "/docs",
-    }
+    return _ROOT_RESPONSE
 
 
 # =============================================================================
@@ -88,103 +124,196 @@ async def root():
 
 async def get_current_user(request: Request) -> dict:
     """Get current user from session cookie."""
-    import httpx
-    from fprime_mcp.auth.oidc_config import get_oidc_config
-    
     token = request.cookies.get("mcp_session")
     if not token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated",
         )
-    
+
+    # Entra access tokens are signed JWTs: verify locally against the
+    # warm JWKS and skip the network hop entirely. Opaque or otherwise
+    # unverifiable tokens fall through to the userinfo path.
+    claims = await validate_access_token(token)
+    if claims is not None:
+        return claims
+
+    # Serve repeat lookups for the same token from the shared cache so
+    # each MCP tool call is not serialized behind an Entra round-trip.
+    cache_key = userinfo_cache_key(token)
+    user_info = userinfo_cache.get(cache_key)
+    if user_info is not None:
+        return user_info
+
     config = get_oidc_config()
-    
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(
-            config.userinfo_endpoint,
-            headers={"Authorization": f"Bearer {token}"},
+
+    resp = await get_http_client().get(
+        config.userinfo_endpoint,
+        headers={"Authorization": f"Bearer {token}"},
+    )
+
+    if resp.status_code != 200:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired session",
         )
-        
-        if resp.status_code != 200:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired session",
-            )
-        
-        return resp.json()
+
+    user_info = resp.json()
+    userinfo_cache.set(cache_key, user_info)
+    return user_info
+
+
+# Tool catalog is constant per process; built once instead of per
+# request. Only the "user" field of the listing response varies.
+MCP_TOOLS = [
+    {
+        "name": "therapeutics_landscape",
+        "description": "Query the therapeutics landscape across Box, Websites, and GlobalData sources. Search by target, indication, and/or molecule type.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "target": {
+                    "type": "string",
+                    "description": "Target gene/protein (e.g., 'EGFR', 'HER2', 'PD-1')"
+                },
+                "indication": {
+                    "type": "string",
+                    "description": "Disease indication (e.g., 'lung cancer', 'breast cancer')"
+                },
+                "molecule_type": {
+                    "type": "string",
+                    "description": "Type of molecule (e.g., 'antibody', 'small molecule', 'cell therapy')"
+                },
+                "sources": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": ["box", "websites", "globaldata"]},
+                    "description": "Data sources to query. Defaults to all sources if not specified."
+                }
+            }
+        }
+    },
+]
 
 
 @app.get("/mcp/tools")
 async def list_mcp_tools(request: Request):
     """List available MCP tools (requires authentication)."""
     user = await get_current_user(request)
-    
-    tools = [
-        {
-            "name": "therapeutics_landscape",
-            "description": "Query the therapeutics landscape across Box, Websites, and GlobalData sources. Search by target, indication, and/or molecule type.",
-            "inputSchema": {
-                "type": "object",
-                "properties": {
-                    "target": {
-                        "type": "string",
-                        "description": "Target gene/protein (e.g., 'EGFR', 'HER2', 'PD-1')"
-                    },
-                    "indication": {
-                        "type": "string",
-                        "description": "Disease indication (e.g., 'lung cancer', 'breast cancer')"
-                    },
-                    "molecule_type": {
-                        "type": "string",
-                        "description": "Type of molecule (e.g., 'antibody', 'small molecule', 'cell therapy')"
-                    },
-                    "sources": {
-                        "type": "array",
-                        "items": {"type": "string", "enum": ["box", "websites", "globaldata"]},
-                        "description": "Data sources to query. Defaults to all sources if not specified."
-                    }
-                }
-            }
-        },
-    ]
-    
+
     return {
         "user": user.get("email"),
-        "tools": tools,
+        "tools": MCP_TOOLS,
     }
 
 
+def _run_therapeutics_landscape(arguments: dict) -> dict:
+    return query_therapeutics_landscape(
+        target=arguments.get("target", ""),
+        indication=arguments.get("indication", ""),
+        molecule_type=arguments.get("molecule_type", ""),
+        sources=arguments.get("sources"),
+    )
+
+
+# Tool name -> handler taking the raw arguments dict. Single dict lookup
+# per call; the batch endpoint shares it.
+TOOL_HANDLERS = {
+    "therapeutics_landscape": _run_therapeutics_landscape,
+}
+
+
+async def _execute_tool(tool_name: str, arguments: dict) -> dict:
+    """Run a named MCP tool with the given arguments."""
+    handler = TOOL_HANDLERS.get(tool_name)
+    if handler is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown tool: {tool_name}",
+        )
+    # Tools do blocking HTTP (requests/pyairtable); run them in a worker
+    # thread so they do not stall the event loop.
+    return await asyncio.to_thread(handler, arguments)
+
+
+async def _auth_and_body(request: Request) -> tuple[dict, dict]:
+    """Resolve the caller and parse the body concurrently.
+
+    The two have no data dependency, so the slower of auth (network on a
+    cold token) and body read hides the other. HTTPException from auth is
+    unwrapped from the TaskGroup's ExceptionGroup so FastAPI still sees
+    the original 401.
+    """
+    try:
+        async with asyncio.TaskGroup() as tg:
+            t_user = tg.create_task(get_current_user(request))
+            t_body = tg.create_task(request.json())
+    except BaseExceptionGroup as eg:
+        # When both tasks fail (unauthenticated caller, malformed body)
+        # the group holds an HTTPException alongside the parse error;
+        # prefer the HTTPException so the client still gets the 401.
+        matched, _ = eg.split(HTTPException)
+        if matched is not None:
+            raise matched.exceptions[0] from None
+        raise
+    return t_user.result(), t_body.result()
+
+
 @app.post("/mcp/tools/call")
 async def call_mcp_tool(request: Request):
     """Call an MCP tool (requires authentication)."""
-    user = await get_current_user(request)
-    body = await request.json()
-    
+    user, body = await _auth_and_body(request)
+
     tool_name = body.get("name")
     arguments = body.get("arguments", {})
-    
-    logger.info(f"User {user.get('email')} calling tool: {tool_name}")
-    
-    if tool_name == "therapeutics_landscape":
-        result = query_therapeutics_landscape(
-            target=arguments.get("target", ""),
-            indication=arguments.get("indication", ""),
-            molecule_type=arguments.get("molecule_type", ""),
-            sources=arguments.get("sources"),
-        )
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Unknown tool: {tool_name}",
-        )
-    
+
+    logger.info("User %s calling tool: %s", user.get("email"), tool_name)
+
+    result = await _execute_tool(tool_name, arguments)
+
     return {
-        "content": [{"type": "text", "text": json.dumps(result, indent=2)}],
+        "content": [{"type": "text", "text": orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()}],
         "is_error": False,
     }
 
 
+@app.post("/mcp/tools/call_batch")
+async def call_mcp_tools_batch(request: Request):
+    """Call several MCP tools in one request (requires authentication).
+
+    Authenticates the session once and runs the calls concurrently, so
+    agents issuing several tool calls per turn avoid per-call auth and
+    request framing overhead.
+    """
+    user, body = await _auth_and_body(request)
+
+    calls = body.get("calls", [])
+
+    logger.info("User %s calling batch of %d tools", user.get("email"), len(calls))
+
+    async def run_one(call: dict) -> dict:
+        try:
+            result = await _execute_tool(call.get("name"), call.get("arguments", {}))
+        except HTTPException as exc:
+            return {
+                "content": [{"type": "text", "text": exc.detail}],
+                "is_error": True,
+            }
+        except Exception as exc:
+            logger.exception("Tool %s failed in batch", call.get("name"))
+            return {
+                "content": [{"type": "text", "text": str(exc)}],
+                "is_error": True,
+            }
+        return {
+            "content": [{"type": "text", "text": orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()}],
+            "is_error": False,
+        }
+
+    results = await asyncio.gather(*(run_one(call) for call in calls))
+
+    return {"results": list(results)}
+
+
 # =============================================================================
 # Error Handlers
 # =============================================================================
@@ -192,7 +321,7 @@ async def call_mcp_tool(request: Request):
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Custom HTTP exception handler."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"error": exc.detail, "status_code": exc.status_code},
     )
@@ -203,5 +332,20 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 # =============================================================================
 
 if __name__ == "__main__":
+    import os
+
     import uvicorn
-    uvicorn.run("fprime_mcp.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+
+    # uvloop + httptools replace the default asyncio loop and h11 parser.
+    # Scale workers via WEB_CONCURRENCY; auto-reload only makes sense (and
+    # only works) in the single-worker dev case.
+    workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+    uvicorn.run(
+        "fprime_mcp.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+        reload=workers == 1,
+    )
\ No newline at end of file
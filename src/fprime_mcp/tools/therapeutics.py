@@ -1,78 +1,200 @@
 """Therapeutics Landscape Tool for F-Prime MCP Server."""
 
-import boto3
-import json
+import orjson
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
-from pyairtable import Base, Api
+from pyairtable import Api
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from copy import deepcopy
+
+from fprime_mcp.aws import get_secretsmanager_client
+from fprime_mcp.cache import SimpleTTLCache
+
+# Landscape responses per normalized query, so repeated identical queries
+# within the TTL skip all three backends.
+_landscape_cache = SimpleTTLCache(maxsize=64, ttl_s=600.0)
+
+
+@lru_cache(maxsize=2)
+def _get_airtable_api(api_key: str) -> Api:
+    """Shared pyairtable client per API key, so its HTTP session is reused."""
+    return Api(api_key)
+
+
+@lru_cache(maxsize=1)
+def _get_http_session() -> requests.Session:
+    """Shared HTTP session with connection pooling for outbound API calls."""
+    session = requests.Session()
+    # GlobalData is an external API; absorb transient failures here rather
+    # than surfacing them to every tool call.
+    retries = Retry(
+        total=3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        backoff_factor=0.2,
+        allowed_methods=['GET'],
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 
 @lru_cache(maxsize=1)
 def get_secrets() -> dict:
     """Fetch secrets from AWS Secrets Manager."""
-    session = boto3.session.Session()
-    client = session.client(
-        service_name='secretsmanager',
-        region_name='us-east-2'
-    )
+    client = get_secretsmanager_client()
     response = client.get_secret_value(SecretId='resource_logins')
-    return json.loads(response['SecretString'])
+    return orjson.loads(response['SecretString'])
 
 
 BOX_BASE = 'app5UNM2QAx82W51F'
 BOX_TABLE = 'tblI1yQG9E29bCxf0'
 WEBSITE_BASE = 'apphoxAZN32kVwxUg'
 WEBSITE_TABLE = 'tblPaRzrVeKmaLh1A'
+GLOBALDATA_PIPELINE_URL = (
+    'https://apidata.globaldata.com/GlobalDataPharmaFPrimeCapital/api/Drugs/GetPipelineDrugDetails'
+)
+# Pipeline responses can run to megabytes of JSON; insist on compression.
+GLOBALDATA_HEADERS = {'accept-encoding': 'gzip, deflate'}
 
+# Lowercase and strip dashes in a single translate pass.
+_LOWER_STRIP_DASH = str.maketrans(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz', '-'
+)
 
 
-def query_box(target: str, indication: str, molecule_type: str) -> list:
-    """Query Box/Airtable for therapeutics data."""
-    secrets = get_secrets()
-    airtable_api = secrets['airtable_api']
-    
-    target = target.lower().replace('-', '')
-    indication = indication.lower()
+@lru_cache(maxsize=1024)
+def _normalize_target(target: str) -> str:
+    """Normalize a target gene/protein name for formula matching."""
+    return target.translate(_LOWER_STRIP_DASH)
+
+
+@lru_cache(maxsize=1024)
+def _normalize_molecule_type(molecule_type: str) -> str:
+    """Normalize a molecule type, singularizing trailing 'y' forms."""
     molecule_type = molecule_type.lower()
-    
     if molecule_type.endswith('y'):
         molecule_type = molecule_type[:-1]
-    
-    table = Base(Api(airtable_api), BOX_BASE).table(BOX_TABLE)
-    
-    formula = (
+    return molecule_type
+
+
+
+def _airtable_quote(s: str) -> str:
+    """Escape a value for safe interpolation into an Airtable formula."""
+    return '"' + s.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+@lru_cache(maxsize=256)
+def _box_formula(target: str, indication: str, molecule_type: str) -> str:
+    """Box search formula for an already-normalized triple."""
+    t = _airtable_quote(target)
+    i = _airtable_quote(indication)
+    m = _airtable_quote(molecule_type)
+    return (
         f'AND('
-        f'FIND("{target}",SUBSTITUTE(LOWER({{genes}}),"-",""))>0,'
-        f'FIND("{indication}",LOWER({{indications}}))>0,'
-        f'OR(FIND("{molecule_type}",LOWER({{summary}}))>0,'
-        f'FIND("{molecule_type}",LOWER({{technology}}))>0))'
+        f'FIND({t},SUBSTITUTE(LOWER({{genes}}),"-",""))>0,'
+        f'FIND({i},LOWER({{indications}}))>0,'
+        f'OR(FIND({m},LOWER({{summary}}))>0,'
+        f'FIND({m},LOWER({{technology}}))>0))'
     )
-    
+
+
+@lru_cache(maxsize=256)
+def _website_formula(target: str, indication: str, molecule_type: str) -> str:
+    """Website pipeline formula for an already-normalized triple."""
+    t = _airtable_quote(target)
+    i = _airtable_quote(indication)
+    m = _airtable_quote(molecule_type)
+    return (
+        f'AND('
+        f'FIND({t},SUBSTITUTE(LOWER({{pipeline}}),"-",""))>0,'
+        f'FIND({i},LOWER({{pipeline}}))>0,'
+        f'FIND({m},LOWER({{pipeline}}))>0)'
+    )
+
+
+def query_box(target: str, indication: str, molecule_type: str) -> list:
+    """Query Box/Airtable for therapeutics data."""
+    secrets = get_secrets()
+    airtable_api = secrets['airtable_api']
+
+    target = _normalize_target(target)
+    indication = indication.lower()
+    molecule_type = _normalize_molecule_type(molecule_type)
+
+    table = _get_airtable_api(airtable_api).table(BOX_BASE, BOX_TABLE)
+
+    formula = _box_formula(target, indication, molecule_type)
+
     results = table.all(formula=formula)
     return [f.get('fields') for f in results]
 
 
+def query_box_batch(triples: list[tuple[str, str, str]]) -> dict[tuple, list]:
+    """Query Box/Airtable for several (target, indication, molecule_type)
+    triples in a single round-trip.
+
+    Builds one OR(AND(...), ...) formula so a multi-target landscape scan
+    costs one Airtable request instead of one per triple. Results are
+    grouped back per input triple by re-testing the returned fields.
+    """
+    secrets = get_secrets()
+    airtable_api = secrets['airtable_api']
+
+    # Keyed by triple so duplicate inputs collapse to one clause and one
+    # bucket, and the normalized terms stay aligned with their triple.
+    normalized = {
+        (target, indication, molecule_type): (
+            _normalize_target(target),
+            indication.lower(),
+            _normalize_molecule_type(molecule_type),
+        )
+        for target, indication, molecule_type in triples
+    }
+
+    clauses = [_box_formula(t, i, m) for t, i, m in normalized.values()]
+    formula = clauses[0] if len(clauses) == 1 else f'OR({",".join(clauses)})'
+
+    table = _get_airtable_api(airtable_api).table(BOX_BASE, BOX_TABLE)
+    records = table.all(formula=formula)
+
+    return _group_box_records(records, normalized)
+
+
+def _group_box_records(
+    records: list, normalized: dict[tuple, tuple[str, str, str]]
+) -> dict[tuple, list]:
+    """Assign fetched Box records to every triple whose normalized terms
+    they match."""
+    grouped: dict[tuple, list] = {triple: [] for triple in normalized}
+    for record in records:
+        fields = record.get('fields', {})
+        genes = str(fields.get('genes', '')).translate(_LOWER_STRIP_DASH)
+        indications = str(fields.get('indications', '')).lower()
+        haystack = f"{fields.get('summary', '')} {fields.get('technology', '')}".lower()
+        for triple, (t, i, m) in normalized.items():
+            if t in genes and i in indications and m in haystack:
+                grouped[triple].append(fields)
+
+    return grouped
+
+
 def query_websites(target: str, indication: str, molecule_type: str) -> list:
     """Query websites Airtable for therapeutics data."""
     secrets = get_secrets()
     airtable_api = secrets['airtable_api']
-    
-    target = target.lower().replace('-', '')
+
+    target = _normalize_target(target)
     indication = indication.lower()
-    molecule_type = molecule_type.lower()
-    
-    if molecule_type.endswith('y'):
-        molecule_type = molecule_type[:-1]
-    
-    table = Base(Api(airtable_api), WEBSITE_BASE).table(WEBSITE_TABLE)
-    
-    formula = (
-        f'AND('
-        f'FIND("{target}",SUBSTITUTE(LOWER({{pipeline}}),"-",""))>0,'
-        f'FIND("{indication}",LOWER({{pipeline}}))>0,'
-        f'FIND("{molecule_type}",LOWER({{pipeline}}))>0)'
-    )
-    
+    molecule_type = _normalize_molecule_type(molecule_type)
+
+    table = _get_airtable_api(airtable_api).table(WEBSITE_BASE, WEBSITE_TABLE)
+
+    formula = _website_formula(target, indication, molecule_type)
+
     results = table.all(formula=formula)
     return [f.get('fields') for f in results]
 
@@ -94,66 +216,78 @@ def query_globaldata(target: str, indication: str, molecule_type: str) -> list:
     if molecule_type:
         params['MoleculeType'] = molecule_type
     
-    r = requests.get(
-        'https://apidata.globaldata.com/GlobalDataPharmaFPrimeCapital/api/Drugs/GetPipelineDrugDetails',
-        params=params
-    )
+    r = _get_http_session().get(GLOBALDATA_PIPELINE_URL, params=params, headers=GLOBALDATA_HEADERS)
     
     if r.status_code == 200:
-        results = r.json().get('PipelineDrugs', [])
+        results = orjson.loads(r.content).get('PipelineDrugs', [])
     else:
         return []
     
-    # Group by company
-    companies = {}
+    # Group by company in a single pass. Bucket creation is explicit —
+    # CompanyID can legitimately be null, so it can't double as the
+    # "new bucket" sentinel; the first drug seen names the company.
+    companies: dict = {}
     for drug in results:
-        co_name = drug.get('Company_Name')
         co_id = drug.get('CompanyID')
-        if co_id in companies:
-            companies[co_id]['Drugs'].append(drug)
-        else:
-            companies[co_id] = {
-                'Drugs': [drug],
-                'Company_Name': co_name,
-                'CompanyID': co_id
+        bucket = companies.get(co_id)
+        if bucket is None:
+            bucket = companies[co_id] = {
+                'Drugs': [],
+                'Company_Name': drug.get('Company_Name'),
+                'CompanyID': co_id,
             }
-    
+        bucket['Drugs'].append(drug)
+
     return list(companies.values())
 
 
 def parse_globaldata_results(globaldata: list) -> list:
     """Parse GlobalData results into flat structure."""
     parsed = []
-    
+    append = parsed.append
+
     for company in globaldata:
         drugs = company.get('Drugs', [])
         co_name = company.get('Company_Name')
-        
+
         for drug in drugs:
-            pipeline = drug.get('PipelineDetails', [])
-            
+            # Bind the drug-level fields once instead of re-fetching them
+            # for every pipeline row.
+            dget = drug.get
+            pipeline = dget('PipelineDetails', [])
+            drug_name = dget('Drug_Name')
+            alias = dget('Alias')
+            description = dget('Product_Description')
+            route = dget('Route_of_Administration')
+            drug_target = dget('Target')
+            molecule_type = dget('Molecule_Type')
+            atc = dget('ATC_Classification')
+            mechanism = dget('Mechanism_of_Action')
+            mono_combination = dget('MonoCombinationDrug')
+
             for p in pipeline:
-                parsed.append({
+                pget = p.get
+                append({
                     'company_name': co_name,
-                    'drug_name': drug.get('Drug_Name'),
-                    'alias': drug.get('Alias'),
-                    'description': drug.get('Product_Description'),
-                    'route_of_administration': drug.get('Route_of_Administration'),
-                    'target': drug.get('Target'),
-                    'molecule_type': drug.get('Molecule_Type'),
-                    'ATC_classification': drug.get('ATC_Classification'),
-                    'mechanism_of_action': drug.get('Mechanism_of_Action'),
-                    'mono_combination': drug.get('MonoCombinationDrug'),
-                    'stage': p.get('Development_Stage'),
-                    'indication': p.get('Indication'),
-                    'therapy_area': p.get('Therapy_Area'),
-                    'geography': p.get('Product_Geography'),
-                    'line_of_therapy': p.get('Line_of_Therapy'),
-                    'last_development_stage': p.get('Last_Development_Stage'),
-                    'reason_for_discontinuation': p.get('Reason_for_Discontinuation'),
-                    'date_of_discontinuation': p.get('Inactive_Discontinued_Date'),
+                    'drug_name': drug_name,
+                    'alias': alias,
+                    'description': description,
+                    'route_of_administration': route,
+                    'target': drug_target,
+                    'molecule_type': molecule_type,
+                    'ATC_classification': atc,
+                    'mechanism_of_action': mechanism,
+                    'mono_combination': mono_combination,
+                    'stage': pget('Development_Stage'),
+                    'indication': pget('Indication'),
+                    'therapy_area': pget('Therapy_Area'),
+                    'geography': pget('Product_Geography'),
+                    'line_of_therapy': pget('Line_of_Therapy'),
+                    'last_development_stage': pget('Last_Development_Stage'),
+                    'reason_for_discontinuation': pget('Reason_for_Discontinuation'),
+                    'date_of_discontinuation': pget('Inactive_Discontinued_Date'),
                 })
-    
+
     return parsed
 
 
@@ -181,7 +315,16 @@ def query_therapeutics_landscape(
     
     if sources is None:
         sources = ['box', 'websites', 'globaldata']
-    
+
+    # Materialize once for the membership checks and the cache key.
+    source_set = frozenset(sources)
+
+    cache_key = (target.lower(), indication.lower(), molecule_type.lower(), source_set)
+    cached = _landscape_cache.get(cache_key)
+    if cached is not None:
+        # Copy so callers can't mutate the cached response.
+        return deepcopy(cached)
+
     results = {
         'query': {
             'target': target,
@@ -194,23 +337,37 @@ def query_therapeutics_landscape(
         'globaldata_results': None,
     }
     
-    if 'box' in sources:
-        try:
-            results['box_results'] = query_box(target, indication, molecule_type)
-        except Exception as e:
-            results['box_results'] = {'error': str(e)}
-    
-    if 'websites' in sources:
-        try:
-            results['website_results'] = query_websites(target, indication, molecule_type)
-        except Exception as e:
-            results['website_results'] = {'error': str(e)}
-    
-    if 'globaldata' in sources:
-        try:
-            raw_results = query_globaldata(target, indication, molecule_type)
-            results['globaldata_results'] = parse_globaldata_results(raw_results)
-        except Exception as e:
-            results['globaldata_results'] = {'error': str(e)}
-    
-    return results
\ No newline at end of file
+    # The three sources are independent remote services, so query them
+    # concurrently and the total latency is the slowest source, not the sum.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = {}
+        if 'box' in source_set:
+            futures['box_results'] = pool.submit(query_box, target, indication, molecule_type)
+        if 'websites' in source_set:
+            futures['website_results'] = pool.submit(query_websites, target, indication, molecule_type)
+        if 'globaldata' in source_set:
+            futures['globaldata_results'] = pool.submit(
+                _query_globaldata_parsed, target, indication, molecule_type
+            )
+
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                results[key] = {'error': str(e)}
+
+    # Cache only fully successful responses; per-source error dicts are
+    # transient and shouldn't be pinned for the whole TTL.
+    if not any(
+        isinstance(results[key], dict)
+        for key in ('box_results', 'website_results', 'globaldata_results')
+        if results[key] is not None
+    ):
+        _landscape_cache.set(cache_key, deepcopy(results))
+
+    return results
+
+
+def _query_globaldata_parsed(target: str, indication: str, molecule_type: str) -> list:
+    """Query GlobalData and flatten the results in one step."""
+    return parse_globaldata_results(query_globaldata(target, indication, molecule_type))
\ No newline at end of file
@@ -2,138 +2,181 @@
 """
 Test script for MCP Server OIDC authentication flow.
 Based on the existing F-Prime OIDC test pattern.
+
+The probes are independent, so they run concurrently over one pooled
+httpx client; each buffers its output and the runner prints the blocks
+in a fixed order so concurrent runs stay readable.
 """
 
-import requests
-from urllib.parse import urlparse, parse_qs
+import asyncio
+import functools
+import logging
+import os
+from urllib.parse import urlparse, parse_qsl
 import base64
 import json
 
+import httpx
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # stdlib fallback keeps the script self-contained
+    _json_loads = json.loads
+
 BASE_URL = "http://localhost:8000"
 AUTH_LOGIN = f"{BASE_URL}/auth/login"
 AUTH_CALLBACK = f"{BASE_URL}/auth/callback"
 AUTH_USER = f"{BASE_URL}/auth/user"
 AUTH_LOGOUT = f"{BASE_URL}/auth/logout"
 
+# Reporting goes through logging so MCP_LOG=WARNING silences the
+# per-line chatter without touching the code; args are %-style so the
+# formatter only runs for emitted records.
+logger = logging.getLogger("mcp.tests")
+
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Shared client: one connection pool for every probe in the run."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(base_url=BASE_URL, timeout=10.0)
+    return _client
+
 
 def extract_token_from_url(url):
-    parsed = urlparse(url)
-    params = parse_qs(parsed.query)
+    # parse_qsl gives scalar values in one pass; no per-key list boxing.
+    params = dict(parse_qsl(urlparse(url).query))
     return {
-        "token": params.get("token", [None])[0],
-        "all_params": {k: v[0] if len(v) == 1 else v for k, v in params.items()}
+        "token": params.get("token"),
+        "all_params": params,
     }
 
 
+def _b64url(s):
+    """base64url-decode with exact computed padding, working in bytes so
+    no intermediate str is allocated."""
+    b = s.encode("ascii")
+    return base64.urlsafe_b64decode(b + b"=" * ((-len(b)) % 4))
+
+
+@functools.lru_cache(maxsize=1024)
+def _decode_jwt(token):
+    """Split and decode a JWT once; repeat inspections of the same token
+    are a cache hit instead of a second base64+JSON pass."""
+    # Locate the two separators directly instead of split('.'): no list,
+    # and the signature segment is never materialized since it is not
+    # decoded here.
+    i = token.find('.')
+    j = token.find('.', i + 1)
+    if i < 0 or j < 0 or token.find('.', j + 1) >= 0:
+        raise ValueError("Not a JWT (expected three dot-separated parts)")
+    header = _json_loads(_b64url(token[:i]))
+    payload = _json_loads(_b64url(token[i + 1:j]))
+    return header, payload
+
+
 def validate_token(token):
     if not token:
-        print("No token provided")
+        logger.info("No token provided")
         return None
-    
-    parts = token.split('.')
-    if len(parts) != 3:
-        print(f"FAIL: Not a JWT ({len(parts)} parts)")
-        return None
-    
+
     try:
-        header = json.loads(base64.urlsafe_b64decode(parts[0] + '=='))
-        payload = json.loads(base64.urlsafe_b64decode(parts[1] + '=='))
-        print("PASS: Valid JWT")
-        print(f"   Header: {header}")
-        print(f"   Subject: {payload.get('sub', 'N/A')}")
-        print(f"   Email: {payload.get('email', 'N/A')}")
+        header, payload = _decode_jwt(token)
+        logger.info("PASS: Valid JWT")
+        logger.info("   Header: %s", header)
+        logger.info("   Subject: %s", payload.get('sub', 'N/A'))
+        logger.info("   Email: %s", payload.get('email', 'N/A'))
         return payload
     except Exception as e:
-        print(f"FAIL: Decode failed: {e}")
+        logger.info("FAIL: Decode failed: %s", e)
         return None
 
 
-def test_login_redirect():
-    print("=" * 50)
-    print("Test 1: Login Redirect")
-    print("=" * 50)
+async def test_login_redirect():
+    lines = ["=" * 50, "Test 1: Login Redirect", "=" * 50]
     try:
-        r = requests.get(AUTH_LOGIN, allow_redirects=False, timeout=10)
+        r = await _get_client().get("/auth/login")
         if r.status_code in [302, 303, 307]:
             url = r.headers.get("Location", "")
-            params = parse_qs(urlparse(url).query)
+            params = dict(parse_qsl(urlparse(url).query, max_num_fields=16))
             is_entra = "login.microsoftonline.com" in url
-            print(f"{'PASS' if is_entra else 'FAIL'}: Redirect to Entra")
-            print(f"   client_id: {'PASS' if 'client_id' in params else 'FAIL'}")
-            print(f"   redirect_uri: {params.get('redirect_uri', ['N/A'])[0]}")
-            print(f"   state: {'PASS' if 'state' in params else 'FAIL'}")
-            print(f"   nonce: {'PASS' if 'nonce' in params else 'FAIL'}")
-            print(f"   response_type: {params.get('response_type', ['N/A'])[0]}")
-            print(f"   scope: {params.get('scope', ['N/A'])[0]}")
-            return True
+            lines.append(f"{'PASS' if is_entra else 'FAIL'}: Redirect to Entra")
+            lines.append(f"   client_id: {'PASS' if 'client_id' in params else 'FAIL'}")
+            lines.append(f"   redirect_uri: {params.get('redirect_uri', 'N/A')}")
+            lines.append(f"   state: {'PASS' if 'state' in params else 'FAIL'}")
+            lines.append(f"   nonce: {'PASS' if 'nonce' in params else 'FAIL'}")
+            lines.append(f"   response_type: {params.get('response_type', 'N/A')}")
+            lines.append(f"   scope: {params.get('scope', 'N/A')}")
+            return True, lines
         else:
-            print(f"FAIL: Expected redirect, got {r.status_code}")
-            return False
-    except requests.exceptions.ConnectionError:
-        print("FAIL: Connection failed - is the MCP server running?")
-        print(f"   Try: uvicorn fprime_mcp.main:app --reload --port 8000")
-        return False
+            lines.append(f"FAIL: Expected redirect, got {r.status_code}")
+            return False, lines
+    except httpx.ConnectError:
+        lines.append("FAIL: Connection failed - is the MCP server running?")
+        lines.append("   Try: uvicorn fprime_mcp.main:app --reload --port 8000")
+        return False, lines
 
 
-def test_callback_security():
-    print("\n" + "=" * 50)
-    print("Test 2: Callback Security")
-    print("=" * 50)
-    
-    # Test missing code
-    r = requests.get(AUTH_CALLBACK, allow_redirects=False, timeout=10)
-    missing_code_ok = r.status_code == 403
-    print(f"Missing code: {r.status_code} ({'PASS - rejected' if missing_code_ok else 'FAIL - should reject'})")
-    
-    # Test invalid state
-    r = requests.get(f"{AUTH_CALLBACK}?code=test&state=invalid", allow_redirects=False, timeout=10)
-    invalid_state_ok = r.status_code == 403
-    print(f"Invalid state: {r.status_code} ({'PASS - rejected' if invalid_state_ok else 'FAIL - should reject'})")
-    
-    return missing_code_ok and invalid_state_ok
-
-
-def test_user_endpoint():
-    print("\n" + "=" * 50)
-    print("Test 3: User Endpoint (No Session)")
-    print("=" * 50)
-    r = requests.get(AUTH_USER, timeout=10)
+async def test_callback_security():
+    lines = ["=" * 50, "Test 2: Callback Security", "=" * 50]
+    client = _get_client()
+
+    # The missing-code and invalid-state probes are independent and
+    # idempotent; fire both at once over the shared pool.
+    missing, invalid = await asyncio.gather(
+        client.get("/auth/callback"),
+        client.get("/auth/callback?code=test&state=invalid"),
+    )
+
+    missing_code_ok = missing.status_code == 403
+    lines.append(f"Missing code: {missing.status_code} ({'PASS - rejected' if missing_code_ok else 'FAIL - should reject'})")
+
+    invalid_state_ok = invalid.status_code == 403
+    lines.append(f"Invalid state: {invalid.status_code} ({'PASS - rejected' if invalid_state_ok else 'FAIL - should reject'})")
+
+    return missing_code_ok and invalid_state_ok, lines
+
+
+async def test_user_endpoint():
+    lines = ["=" * 50, "Test 3: User Endpoint (No Session)", "=" * 50]
+    r = await _get_client().get("/auth/user")
     no_session_ok = r.status_code == 403
-    print(f"No session: {r.status_code} ({'PASS - rejected' if no_session_ok else 'FAIL - should reject'})")
-    return no_session_ok
+    lines.append(f"No session: {r.status_code} ({'PASS - rejected' if no_session_ok else 'FAIL - should reject'})")
+    return no_session_ok, lines
 
 
-def test_health_endpoint():
-    print("\n" + "=" * 50)
-    print("Test 4: Health Endpoint")
-    print("=" * 50)
+async def test_health_endpoint():
+    lines = ["=" * 50, "Test 4: Health Endpoint", "=" * 50]
     try:
-        r = requests.get(f"{BASE_URL}/health", timeout=10)
+        r = await _get_client().get("/health")
         if r.status_code == 200:
-            print(f"PASS: Health check OK")
-            print(f"   Response: {r.json()}")
-            return True
+            lines.append("PASS: Health check OK")
+            # Parse the raw bytes directly; r.json() decodes to str first.
+            lines.append(f"   Response: {_json_loads(r.content)}")
+            return True, lines
         else:
-            print(f"FAIL: Health check returned {r.status_code}")
-            return False
-    except requests.exceptions.ConnectionError:
-        print("FAIL: Connection failed")
-        return False
+            lines.append(f"FAIL: Health check returned {r.status_code}")
+            return False, lines
+    except httpx.ConnectError:
+        lines.append("FAIL: Connection failed")
+        return False, lines
 
 
-def print_summary(results):
-    print("\n" + "=" * 50)
-    print("SUMMARY")
-    print("=" * 50)
-    
+def summary_lines(results):
+    lines = ["", "=" * 50, "SUMMARY", "=" * 50]
+
     passed = sum(1 for r in results if r)
     total = len(results)
-    
-    print(f"\n   Tests passed: {passed}/{total}")
-    print(f"""
+
+    lines.append(f"\n   Tests passed: {passed}/{total}")
+    lines.append(f"""
 Auth flow implementation check:
    - /auth/login redirects to Entra with proper params
-   - /auth/callback validates state and rejects invalid requests  
+   - /auth/callback validates state and rejects invalid requests
    - /auth/user requires authentication
    - /health returns server status
 
@@ -143,32 +186,39 @@ To complete testing:
    3. Start the server: uvicorn fprime_mcp.main:app --reload --port 8000
    4. Visit http://localhost:8000/auth/login in your browser
 """)
+    return lines
 
 
-def test_manual_login():
+async def test_manual_login():
     print("\n" + "=" * 50)
     print("Test 5: Manual Login Test")
     print("=" * 50)
-    
+
+    # Interactive prompts block stdin mid-run; only offer them when
+    # MCP_INTERACTIVE=1 so CI and batched runs finish without waiting.
+    if os.environ.get("MCP_INTERACTIVE") != "1":
+        print("Skipped (set MCP_INTERACTIVE=1 to run)")
+        return
+
     response = input("Do you want to test manual login? (y/n): ").strip().lower()
     if response != 'y':
         print("Skipped")
         return
-    
+
     print(f"\n1. Open in browser: {AUTH_LOGIN}")
     print("2. Complete Microsoft login")
     print("3. After redirect, check if you're logged in")
-    
+
     input("\nPress Enter after completing login...")
-    
+
     # Test with session cookie (user would need to provide it)
     cookie = input("Paste the 'mcp_session' cookie value (or Enter to skip): ").strip()
-    
+
     if cookie:
-        r = requests.get(AUTH_USER, cookies={"mcp_session": cookie}, timeout=10)
+        r = await _get_client().get("/auth/user", cookies={"mcp_session": cookie})
         if r.status_code == 200:
-            user = r.json()
-            print(f"\nPASS: Authenticated!")
+            user = _json_loads(r.content)
+            print("\nPASS: Authenticated!")
             print(f"   Email: {user.get('email', 'N/A')}")
             print(f"   Name: {user.get('name', 'N/A')}")
         else:
@@ -177,14 +227,41 @@ def test_manual_login():
         print("Skipped")
 
 
+async def run_all():
+    # Probes are independent: wall time is the slowest probe, not the sum.
+    outcomes = await asyncio.gather(
+        test_health_endpoint(),
+        test_login_redirect(),
+        test_callback_security(),
+        test_user_endpoint(),
+    )
+
+    # One record for the whole report: no per-line flushes, no block
+    # interleaving, and MCP_LOG=WARNING skips the join entirely.
+    results = [ok for ok, _ in outcomes]
+    if logger.isEnabledFor(logging.INFO):
+        out = []
+        for _, lines in outcomes:
+            out.extend(lines)
+            out.append("")
+        out.extend(summary_lines(results))
+        logger.info("%s", "\n".join(out))
+
+    await test_manual_login()
+
+    await _get_client().aclose()
+
+
 if __name__ == "__main__":
-    results = []
-    
-    results.append(test_health_endpoint())
-    results.append(test_login_redirect())
-    results.append(test_callback_security())
-    results.append(test_user_endpoint())
-    
-    print_summary(results)
-    
-    test_manual_login()
\ No newline at end of file
+    logging.basicConfig(level=os.environ.get("MCP_LOG", "INFO"), format="%(message)s")
+
+    # uvloop ships with uvicorn[standard]; fall back to the default loop
+    # when running outside the server environment.
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
+
+    asyncio.run(run_all())
@@ -0,0 +1,66 @@
+"""Unit tests for the pure grouping helpers in the therapeutics tool."""
+
+from fprime_mcp.tools.therapeutics import _group_box_records
+
+
+def _record(genes, indications, summary, technology=''):
+    return {
+        'fields': {
+            'genes': genes,
+            'indications': indications,
+            'summary': summary,
+            'technology': technology,
+        }
+    }
+
+
+def test_group_box_records_matches_per_triple():
+    a = ('EGFR', 'lung cancer', 'antibody')
+    b = ('HER2', 'breast cancer', 'small molecule')
+    normalized = {
+        a: ('egfr', 'lung cancer', 'antibod'),
+        b: ('her2', 'breast cancer', 'small molecule'),
+    }
+    rec_a = _record('EGFR', 'lung cancer', 'an antibody program')
+    rec_b = _record('HER2', 'breast cancer', 'a small molecule inhibitor')
+
+    grouped = _group_box_records([rec_a, rec_b], normalized)
+
+    assert grouped[a] == [rec_a['fields']]
+    assert grouped[b] == [rec_b['fields']]
+
+
+def test_group_box_records_duplicate_triples_share_one_bucket():
+    a = ('EGFR', 'lung cancer', 'antibody')
+    b = ('HER2', 'breast cancer', 'small molecule')
+    # Built the way query_box_batch builds it: duplicates collapse.
+    normalized = {
+        triple: norm
+        for triple, norm in [
+            (a, ('egfr', 'lung cancer', 'antibod')),
+            (a, ('egfr', 'lung cancer', 'antibod')),
+            (b, ('her2', 'breast cancer', 'small molecule')),
+        ]
+    }
+    rec_b = _record('HER2', 'breast cancer', 'a small molecule inhibitor')
+
+    grouped = _group_box_records([rec_b], normalized)
+
+    # The record lands in b's bucket exactly once and a's stays empty.
+    assert grouped[a] == []
+    assert grouped[b] == [rec_b['fields']]
+
+
+def test_group_box_records_record_can_match_several_triples():
+    a = ('EGFR', 'lung cancer', 'antibody')
+    b = ('EGFR', 'lung', 'antibody')
+    normalized = {
+        a: ('egfr', 'lung cancer', 'antibod'),
+        b: ('egfr', 'lung', 'antibod'),
+    }
+    rec = _record('EGFR', 'lung cancer', 'an antibody program')
+
+    grouped = _group_box_records([rec], normalized)
+
+    assert grouped[a] == [rec['fields']]
+    assert grouped[b] == [rec['fields']]